@@ -1,10 +1,8 @@
+from functools import lru_cache
 from pathlib import Path
-from dotenv import load_dotenv
+from types import MappingProxyType
 import os
 
-# Load environment variables from .env file at project root
-load_dotenv()
-
 # Project folders
 PROJECT_FOLDER = Path(__file__).resolve().parents[1]
 DATA_FOLDER = PROJECT_FOLDER / "data"
@@ -13,44 +11,98 @@ DATA_FOLDER = PROJECT_FOLDER / "data"
 RAW_DATA = DATA_FOLDER / "raw_data"
 PROCESSED_DATA = DATA_FOLDER / "processed_data"
 WASDE_FOLDER = DATA_FOLDER / "wasde_files"
+IMAGES_FOLDER = DATA_FOLDER / "images"
+CACHE_FOLDER = PROJECT_FOLDER / ".cache"
+
+# File constants are resolved lazily on first access (see __getattr__ below)
+_FILES = {
+    # Commodity files
+    "WHEAT": (PROCESSED_DATA, "wheat.parquet"),
+    "WHEAT_CURRENT": (PROCESSED_DATA, "wheat_current.parquet"),
+    "WHEAT_NEXT": (PROCESSED_DATA, "wheat_next.parquet"),
+    "WHEAT_OUTLOOK": (PROCESSED_DATA, "wheat_outlook.parquet"),
+    "CORN": (PROCESSED_DATA, "corn.parquet"),
+    "CORN_CURRENT": (PROCESSED_DATA, "corn_current.parquet"),
+    "CORN_NEXT": (PROCESSED_DATA, "corn_next.parquet"),
+    "CORN_OUTLOOK": (PROCESSED_DATA, "corn_outlook.parquet"),
+    "SOYBEAN": (PROCESSED_DATA, "soybean.parquet"),
+    "SOYBEAN_CURRENT": (PROCESSED_DATA, "soybean_current.parquet"),
+    "SOYBEAN_NEXT": (PROCESSED_DATA, "soybean_next.parquet"),
+    "SOYBEAN_OUTLOOK": (PROCESSED_DATA, "soybean_outlook.parquet"),
+    "SOYBEAN_OIL": (PROCESSED_DATA, "soybean_oil.parquet"),
+    "SOYBEAN_OIL_CURRENT": (PROCESSED_DATA, "soybean_oil_current.parquet"),
+    "SOYBEAN_OIL_NEXT": (PROCESSED_DATA, "soybean_oil_next.parquet"),
+    "SOYBEAN_OIL_OUTLOOK": (PROCESSED_DATA, "soybean_oil_outlook.parquet"),
+    "SOYBEAN_MEAL": (PROCESSED_DATA, "soybean_meal.parquet"),
+    "SOYBEAN_MEAL_CURRENT": (PROCESSED_DATA, "soybean_meal_current.parquet"),
+    "SOYBEAN_MEAL_NEXT": (PROCESSED_DATA, "soybean_meal_next.parquet"),
+    "SOYBEAN_MEAL_OUTLOOK": (PROCESSED_DATA, "soybean_meal_outlook.parquet"),
+    "COMMODITY": (PROCESSED_DATA, "commodity.parquet"),
+    # Model files
+    "MODEL_SOYBEAN": (PROCESSED_DATA, "model_soybean.parquet"),
+    # Quotes files
+    "CORN_QUOTES": (PROCESSED_DATA, "corn_quotes.parquet"),
+    "SOYBEAN_QUOTES": (PROCESSED_DATA, "soybean_quotes.parquet"),
+    "SOYBEAN_PREMIUM_QUOTES": (PROCESSED_DATA, "soybean_premium_quotes.parquet"),
+    # Image Files
+    "FORECAST_SCENARIOS": (IMAGES_FOLDER, "forecast_scenarios_animated.gif"),
+}
+
+# Settings read from the environment / .env file on first access
+# LEGACY_XLSX=1 also writes an .xlsx copy next to each processed Parquet file
+# WASDE_JWT is the token used for Cornell USDA API access
+_ENV_SETTINGS = {
+    "LEGACY_XLSX": lambda env: env.get("LEGACY_XLSX") == "1",
+    "WASDE_JWT": lambda env: env.get("WASDE_JWT"),
+}
+
+def __getattr__(name):
+    if name in _FILES:
+        folder, filename = _FILES[name]
+        value = folder / filename
+    elif name in _ENV_SETTINGS:
+        value = _ENV_SETTINGS[name](_env())
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted({*globals(), *_FILES, *_ENV_SETTINGS})
+
+@lru_cache(maxsize=1)
+def _env():
+    """Parses the .env file at project root once per process; real environment variables take precedence."""
+    from dotenv import dotenv_values
+
+    return MappingProxyType({**dotenv_values(PROJECT_FOLDER / ".env"), **os.environ})
+
+def load_excel(path, sheet=None, **kwargs):
+    """Parses one sheet (the first by default) with the calamine engine, closing the workbook before returning."""
+    import pandas as pd
+
+    with pd.ExcelFile(path, engine="calamine") as workbook:
+        return workbook.parse(0 if sheet is None else sheet, **kwargs)
+
+def read_processed(path):
+    """Reads a processed table, falling back to the legacy .xlsx file when no Parquet copy exists yet."""
+    import pandas as pd
+
+    path = Path(path)
+    if path.exists():
+        return pd.read_parquet(path)
+    return load_excel(path.with_suffix(".xlsx"))
+
+def write_processed(df, path):
+    """Writes a processed table as zstd-compressed Parquet (plus an .xlsx copy when LEGACY_XLSX is set)."""
+    path = Path(path)
+    df.to_parquet(path, compression="zstd")
+    if __getattr__("LEGACY_XLSX"):
+        df.to_excel(path.with_suffix(".xlsx"), index=False)
 
-# Commodity files
-WHEAT = PROCESSED_DATA / "wheat.xlsx"
-WHEAT_CURRENT = PROCESSED_DATA / "wheat_current.xlsx"
-WHEAT_NEXT = PROCESSED_DATA / "wheat_next.xlsx"
-WHEAT_OUTLOOK = PROCESSED_DATA / "wheat_outlook.xlsx"
-CORN = PROCESSED_DATA / "corn.xlsx"
-CORN_CURRENT = PROCESSED_DATA / "corn_current.xlsx"
-CORN_NEXT = PROCESSED_DATA / "corn_next.xlsx"
-CORN_OUTLOOK = PROCESSED_DATA / "corn_outlook.xlsx"
-SOYBEAN = PROCESSED_DATA / "soybean.xlsx"
-SOYBEAN_CURRENT = PROCESSED_DATA / "soybean_current.xlsx"
-SOYBEAN_NEXT = PROCESSED_DATA / "soybean_next.xlsx"
-SOYBEAN_OUTLOOK = PROCESSED_DATA / "soybean_outlook.xlsx"
-SOYBEAN_OIL = PROCESSED_DATA / "soybean_oil.xlsx"
-SOYBEAN_OIL_CURRENT = PROCESSED_DATA / "soybean_oil_current.xlsx"
-SOYBEAN_OIL_NEXT = PROCESSED_DATA / "soybean_oil_next.xlsx"
-SOYBEAN_OIL_OUTLOOK = PROCESSED_DATA / "soybean_oil_outlook.xlsx"
-SOYBEAN_MEAL = PROCESSED_DATA / "soybean_meal.xlsx"
-SOYBEAN_MEAL_CURRENT = PROCESSED_DATA / "soybean_meal_current.xlsx"
-SOYBEAN_MEAL_NEXT = PROCESSED_DATA / "soybean_meal_next.xlsx"
-SOYBEAN_MEAL_OUTLOOK = PROCESSED_DATA / "soybean_meal_outlook.xlsx"
-COMMODITY = PROCESSED_DATA / "commodity.xlsx"
-
-# Model files
-MODEL_SOYBEAN = PROCESSED_DATA / "model_soybean.xlsx"
-
-# Quotes files
-CORN_QUOTES = PROCESSED_DATA / "corn_quotes.xlsx"
-SOYBEAN_QUOTES = PROCESSED_DATA / "soybean_quotes.xlsx"
-SOYBEAN_PREMIUM_QUOTES = PROCESSED_DATA / "soybean_premium_quotes.xlsx"
-
-# Image Files
-FORECAST_SCENARIOS = DATA_FOLDER / "images" / "forecast_scenarios_animated.gif"
-
-# WASDE Token (used for Cornell USDA API access)
-WASDE_JWT = os.getenv("WASDE_JWT")
-
-# Optional: raise an error if token is missing
-if WASDE_JWT is None:
-    raise EnvironmentError("Missing WASDE_JWT in your .env file")
+def get_wasde_jwt():
+    """Returns the WASDE token, raising only when a caller actually needs it."""
+    token = __getattr__("WASDE_JWT")
+    if token is None:
+        raise EnvironmentError("Missing WASDE_JWT in your .env file")
+    return token
@@ -1,6 +1,34 @@
 # eda_utils.py
+import numpy as np
 import pandas as pd
 
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional; the numpy kernel is used instead
+    njit = None
+
+def downcast_dtypes(df, max_category_ratio=0.5):
+    """
+    Shrinks a DataFrame's memory footprint for the numeric-heavy EDA pipeline.
+    
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Frame with float64 measurements and optional string key columns
+    max_category_ratio : float
+        String columns with at most this share of unique values become categorical
+        
+    Returns:
+    --------
+    pd.DataFrame
+        Frame with float64 columns cast to float32 and low-cardinality strings to category
+    """
+    dtypes = {col: 'float32' for col in df.select_dtypes('float64').columns}
+    for col in df.select_dtypes('object').columns:
+        if df[col].nunique() <= max_category_ratio * len(df):
+            dtypes[col] = 'category'
+    return df.astype(dtypes)
+
 def preprocess_wasde_data(df_wasde):
     """
     Preprocesses WASDE report data by ensuring proper datetime formatting and sorting.
@@ -15,9 +43,8 @@ def preprocess_wasde_data(df_wasde):
     pd.DataFrame
         Processed WASDE data with datetime index
     """
-    df = df_wasde.copy()
-    df["report_date"] = pd.to_datetime(df["report_date"])
-    return df.sort_values("report_date").reset_index(drop=True)
+    df = df_wasde.assign(report_date=pd.to_datetime(df_wasde["report_date"]))
+    return downcast_dtypes(df.sort_values("report_date", ignore_index=True))
 
 def preprocess_futures_data(df_quotes):
     """
@@ -33,14 +60,66 @@ def preprocess_futures_data(df_quotes):
     pd.DataFrame
         Processed data with composite soybean price and datetime index
     """
-    df = df_quotes.copy()
+    # Only the columns used downstream are copied and sorted
+    df = df_quotes[["date", "soybean_quote", "soybean_premium", "corn_quote"]].copy()
+
     # Calculate soybean composite price (conversion to USD/MT)
-    df['soybean'] = ((df['soybean_quote'] + df['soybean_premium']) / 100) * 36.7454
-    df = df.drop(columns=["soybean_quote", "soybean_premium"])
+    df["soybean"] = ((df.pop("soybean_quote") + df.pop("soybean_premium")) / 100) * 36.7454
     df["date"] = pd.to_datetime(df["date"])
-    return df.sort_values("date").reset_index(drop=True)
+    return downcast_dtypes(df.sort_values("date", ignore_index=True))
+
+def _report_buckets(report_dates, window_end, quote_dates):
+    # Bucket every quote into the report whose window contains it: report i
+    # covers [report_date[i-1], report_date[i] - 1 day]
+    report_idx = np.searchsorted(report_dates, quote_dates, side="right")
+    in_window = (report_idx > 0) & (report_idx < len(report_dates))
+    in_window[in_window] = quote_dates[in_window] <= window_end[report_idx[in_window]]
+    return report_idx, in_window
+
+def _window_means_pandas(report_dates, window_end, df_quotes):
+    report_idx, in_window = _report_buckets(
+        report_dates.to_numpy(), window_end.to_numpy(), df_quotes["date"].to_numpy()
+    )
+    return (
+        df_quotes.loc[in_window, ["corn_quote", "soybean"]]
+        .groupby(report_idx[in_window])
+        .mean()
+    )
+
+def _window_means_polars(report_dates, window_end, df_quotes):
+    # Same buckets as the searchsorted path, computed by Polars' multi-threaded
+    # as-of join and group-by
+    import polars as pl
+
+    reports = pl.DataFrame({
+        "report_date": report_dates.to_numpy(),
+        "window_end": window_end.shift(-1).to_numpy(),
+    }).with_row_index("report_idx", offset=1)
+    quotes = pl.from_pandas(df_quotes[["date", "corn_quote", "soybean"]]).sort("date")
+
+    means = (
+        quotes.join_asof(reports, left_on="date", right_on="report_date", strategy="backward")
+        .filter(pl.col("date") <= pl.col("window_end"))
+        .group_by("report_idx")
+        .agg(pl.col("corn_quote").mean(), pl.col("soybean").mean())
+        .to_pandas()
+    )
+    return means.set_index("report_idx")
+
+def _attach_window_means(df_wasde, window_means):
+    # window_means is indexed by report position; report 0 has no preceding window
+    report_dates = df_wasde["report_date"]
+    window_end = report_dates - pd.Timedelta(days=1)
+    window_means = window_means.reindex(range(1, len(df_wasde)))
+
+    df = df_wasde.iloc[1:].reset_index(drop=True)
+    df["corn_quote"] = window_means["corn_quote"].to_numpy()
+    df["soybean"] = window_means["soybean"].to_numpy()
+    df["window_start"] = report_dates.iloc[:-1].to_numpy()
+    df["window_end"] = window_end.iloc[1:].to_numpy()
+    return df
 
-def aggregate_prices_by_report_window(df_wasde, df_quotes):
+def aggregate_prices_by_report_window(df_wasde, df_quotes, engine="pandas"):
     """
     Aggregates futures prices between consecutive WASDE report dates.
     
@@ -50,37 +129,67 @@ def aggregate_prices_by_report_window(df_wasde, df_quotes):
         Preprocessed WASDE report data
     df_quotes : pd.DataFrame
         Preprocessed futures quotes data
+    engine : str
+        "pandas" (default) or "polars" to run the bucketing join and group-by in Polars
         
     Returns:
     --------
     pd.DataFrame
         Modeling-ready DataFrame with WASDE features and aggregated prices
     """
-    records = []
-    
-    for i in range(1, len(df_wasde)):
-        current_report = df_wasde.iloc[i]
-        prev_report_date = df_wasde.iloc[i-1]["report_date"]
-        window_end = current_report["report_date"] - pd.Timedelta(days=1)
-        
-        # Filter quotes in the reporting window
-        mask = (df_quotes["date"] >= prev_report_date) & (df_quotes["date"] <= window_end)
-        window_quotes = df_quotes.loc[mask]
-        
-        # Create merged record
-        record = current_report.to_dict()
-        record.update({
-            "corn_quote": window_quotes["corn_quote"].mean(),
-            "soybean": window_quotes["soybean"].mean(),
-            "window_start": prev_report_date,
-            "window_end": window_end
-        })
-        records.append(record)
-    
-    return pd.DataFrame(records)
+    report_dates = df_wasde["report_date"]
+    window_end = report_dates - pd.Timedelta(days=1)
+
+    if engine == "polars":
+        window_means = _window_means_polars(report_dates, window_end, df_quotes)
+    elif engine == "pandas":
+        window_means = _window_means_pandas(report_dates, window_end, df_quotes)
+    else:
+        raise ValueError(f"Unknown engine: {engine!r}")
+    return _attach_window_means(df_wasde, window_means)
+
+def _prepare_modeling_data_arrow(raw_wasde, raw_quotes):
+    # Preprocessing and aggregation run on Arrow tables; pandas only at the boundary
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    wasde = pa.Table.from_pandas(raw_wasde, preserve_index=False)
+    date_pos = wasde.schema.get_field_index("report_date")
+    wasde = wasde.set_column(
+        date_pos, "report_date", pc.cast(wasde["report_date"], pa.timestamp("ns"))
+    ).sort_by("report_date")
+
+    quotes = pa.Table.from_pandas(
+        raw_quotes[["date", "soybean_quote", "soybean_premium", "corn_quote"]], preserve_index=False
+    )
+    # Calculate soybean composite price (conversion to USD/MT)
+    soybean = pc.multiply(
+        pc.divide(pc.add(quotes["soybean_quote"], quotes["soybean_premium"]), 100.0), 36.7454
+    )
+    quotes = pa.table({
+        "date": pc.cast(quotes["date"], pa.timestamp("ns")),
+        "corn_quote": quotes["corn_quote"],
+        "soybean": soybean,
+    })
+
+    report_dates = wasde["report_date"].to_numpy()
+    report_idx, in_window = _report_buckets(
+        report_dates, report_dates - np.timedelta64(1, "D"), quotes["date"].to_numpy()
+    )
+    window_means = (
+        quotes.select(["corn_quote", "soybean"])
+        .append_column("report_idx", pa.array(report_idx))
+        .filter(pa.array(in_window))
+        .group_by("report_idx")
+        .aggregate([("corn_quote", "mean"), ("soybean", "mean")])
+        .rename_columns(["report_idx", "corn_quote", "soybean"])
+        .to_pandas()
+        .set_index("report_idx")
+    )
+    return downcast_dtypes(_attach_window_means(wasde.to_pandas(), window_means))
 
 # Função principal que orquestra todo o processo
-def prepare_modeling_data(raw_wasde, raw_quotes):
+def prepare_modeling_data(raw_wasde, raw_quotes, engine="pandas"):
     """
     Full pipeline to transform raw WASDE and futures data into modeling-ready format.
     
@@ -90,48 +199,106 @@ def prepare_modeling_data(raw_wasde, raw_quotes):
         Raw WASDE report data
     raw_quotes : pd.DataFrame
         Raw futures market data
+    engine : str
+        "pandas" (default), "polars" for the report-window aggregation only,
+        or "arrow" to run the whole pipeline on pyarrow compute kernels
         
     Returns:
     --------
     pd.DataFrame
         Final modeling dataset
     """
+    if engine == "arrow":
+        return _prepare_modeling_data_arrow(raw_wasde, raw_quotes)
     df_wasde = preprocess_wasde_data(raw_wasde)
     df_quotes = preprocess_futures_data(raw_quotes)
-    return aggregate_prices_by_report_window(df_wasde, df_quotes)
+    return aggregate_prices_by_report_window(df_wasde, df_quotes, engine=engine)
+
+def _lagged_corr_numpy(X, y, max_lag):
+    # Pearson correlation of target[t] with every exog column at t - lag, using
+    # pairwise-complete observations per column (same as Series.corr)
+    corr = np.full((X.shape[1], max_lag), np.nan, dtype=X.dtype)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for lag in range(1, min(max_lag, len(X) - 1) + 1):
+            x_lag = X[:-lag]
+            y_lag = np.broadcast_to(y[lag:, None], x_lag.shape)
+            valid = ~np.isnan(x_lag) & ~np.isnan(y_lag)
+            n = valid.sum(axis=0)
+            dx = np.where(valid, x_lag - np.where(valid, x_lag, 0).sum(axis=0) / n, 0)
+            dy = np.where(valid, y_lag - np.where(valid, y_lag, 0).sum(axis=0) / n, 0)
+            cov = np.einsum("nc,nc->c", dx, dy)
+            corr[:, lag - 1] = cov / np.sqrt(np.einsum("nc,nc->c", dx, dx) * np.einsum("nc,nc->c", dy, dy))
+    return corr
+
+if njit is not None:
+    # fastmath without the no-NaN/no-Inf flags: the kernel relies on isnan to skip missing pairs
+    @njit(parallel=True, fastmath={"reassoc", "contract", "arcp"}, cache=True)
+    def _lagged_corr_numba(X, y, max_lag):
+        n_obs, n_cols = X.shape
+        corr = np.full((n_cols, max_lag), np.nan, dtype=X.dtype)
+        for c in prange(n_cols):
+            for lag in range(1, min(max_lag, n_obs - 1) + 1):
+                n = 0
+                sum_x = 0.0
+                sum_y = 0.0
+                for t in range(n_obs - lag):
+                    x, y_t = X[t, c], y[t + lag]
+                    if not (np.isnan(x) or np.isnan(y_t)):
+                        n += 1
+                        sum_x += x
+                        sum_y += y_t
+                if n < 2:
+                    continue
+                mean_x = sum_x / n
+                mean_y = sum_y / n
+                sxx = 0.0
+                syy = 0.0
+                sxy = 0.0
+                for t in range(n_obs - lag):
+                    x, y_t = X[t, c], y[t + lag]
+                    if not (np.isnan(x) or np.isnan(y_t)):
+                        dx = x - mean_x
+                        dy = y_t - mean_y
+                        sxx += dx * dx
+                        syy += dy * dy
+                        sxy += dx * dy
+                if sxx > 0.0 and syy > 0.0:
+                    corr[c, lag - 1] = sxy / np.sqrt(sxx * syy)
+        return corr
+
+def _lagged_corr(X, y, max_lag):
+    """Lagged correlation matrix of shape (n_columns, max_lag), JIT-compiled when numba is installed."""
+    if njit is not None:
+        return _lagged_corr_numba(X, y, max_lag)
+    return _lagged_corr_numpy(X, y, max_lag)
 
 def test_lagged_correlation(df, target_col='soybean', date_col='report_date', max_lag=6):
     df = df.sort_values(date_col).reset_index(drop=True)
     df[date_col] = pd.to_datetime(df[date_col])
     exog_cols = [col for col in df.columns if col not in [target_col, date_col]]
 
-    rows = []
-    for col in exog_cols:
-        for lag in range(1, max_lag + 1):
-            shifted = df[col].shift(lag)
-            corr = df[target_col].corr(shifted)
-            rows.append({
-                'Variable': col,
-                'Lag (months)': lag,
-                'Correlation with Target': corr
-            })
-
-    corr_df = pd.DataFrame(rows)
-    return corr_df.pivot(index='Variable', columns='Lag (months)', values='Correlation with Target')
+    X = df[exog_cols].to_numpy(dtype=np.float32, na_value=np.nan)
+    y = df[target_col].to_numpy(dtype=np.float32, na_value=np.nan)
 
+    corr = _lagged_corr(X, y, max_lag)
 
-def top_lagged_predictors(pivot_table, top_n=10):
-    best_lags = (
-        pivot_table.abs()
-        .stack()
-        .reset_index()
-        .rename(columns={0: 'Absolute Correlation'})
+    result = pd.DataFrame(
+        corr,
+        index=pd.Index(exog_cols, name='Variable'),
+        columns=pd.Index(range(1, max_lag + 1), name='Lag (months)'),
     )
+    return result.sort_index()
 
-    best_lags['Signed Correlation'] = [
-        pivot_table.loc[row['Variable'], row['Lag (months)']] for _, row in best_lags.iterrows()
-    ]
+
+def top_lagged_predictors(pivot_table, top_n=10):
+    best_lags = pd.concat(
+        [
+            pivot_table.stack().rename('Signed Correlation'),
+            pivot_table.abs().stack().rename('Absolute Correlation'),
+        ],
+        axis=1,
+    ).reset_index()
 
     best_lags = best_lags.sort_values('Absolute Correlation', ascending=False).drop_duplicates('Variable')
 
-    return best_lags[['Variable', 'Lag (months)', 'Signed Correlation', 'Absolute Correlation']].head(top_n)
\ No newline at end of file
+    return best_lags[['Variable', 'Lag (months)', 'Signed Correlation', 'Absolute Correlation']].head(top_n)
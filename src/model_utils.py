@@ -1,48 +1,87 @@
+import hashlib
+from pathlib import Path
 import numpy as np
 import pandas as pd
+from joblib import Memory, Parallel, delayed
 from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
 from statsmodels.tsa.statespace.sarimax import SARIMAX
+from config import CACHE_FOLDER
 
-def walk_forward_forecast(y, exog, order, seasonal_order, n_test=6, verbose=True):
-    history_y = y[:-n_test].copy()
-    history_X = exog[:-n_test].copy()
-    test_y = y[-n_test:]
-    test_X = exog[-n_test:]
-
-    predictions = []
-    for i in range(n_test):
-        exog_input = test_X.iloc[[i]]
-        model = SARIMAX(
-            history_y, exog=history_X,
-            order=order, seasonal_order=seasonal_order,
-            enforce_stationarity=False, enforce_invertibility=False
+# On-disk memo of walk-forward backtests, keyed on the data, orders and fitting mode.
+# Versioned by this module's source: joblib only tracks the memoized function itself,
+# so an edit to the fit helpers must start a fresh cache
+_MEMORY = Memory(CACHE_FOLDER / "sarimax" / hashlib.sha1(Path(__file__).read_bytes()).hexdigest()[:12], verbose=0)
+
+def _fit_predict_one_step(y, exog, train_end, order, seasonal_order, start_params=None):
+    """Fits SARIMAX on the first train_end observations and predicts observation train_end."""
+    history_y = y.iloc[:train_end]
+    history_X = exog.iloc[:train_end]
+    model = SARIMAX(
+        history_y, exog=history_X,
+        order=order, seasonal_order=seasonal_order,
+        enforce_stationarity=False, enforce_invertibility=False
+    )
+    results = model.fit(start_params=start_params, disp=False, method='powell')
+    pred = results.predict(start=train_end, end=train_end, exog=exog.iloc[[train_end]])
+    return pred.values[0], np.asarray(results.params)
+
+@_MEMORY.cache
+def _walk_forward(y, exog, order, seasonal_order, n_test, n_jobs):
+    train_end = len(y) - n_test
+    test_y = y.iloc[train_end:]
+
+    if n_jobs is None:
+        predictions = []
+        prev_params = None
+        for i in range(n_test):
+            # Warm-start from the previous fold's optimum: appending a single observation barely moves it
+            pred, prev_params = _fit_predict_one_step(
+                y, exog, train_end + i, order, seasonal_order, start_params=prev_params
+            )
+            predictions.append(pred)
+    else:
+        # Folds are independent when every fit starts from scratch
+        fits = Parallel(n_jobs=n_jobs)(
+            delayed(_fit_predict_one_step)(y, exog, train_end + i, order, seasonal_order)
+            for i in range(n_test)
         )
-        results = model.fit(disp=False, method='powell')
-        pred = results.predict(start=len(history_y), end=len(history_y), exog=exog_input)
-        predictions.append(pred.values[0])
+        predictions = [pred for pred, _ in fits]
 
-        history_y = pd.concat([history_y, test_y.iloc[i:i+1]])
-        history_X = pd.concat([history_X, test_X.iloc[i:i+1]])
+    return test_y.values, np.array(predictions), test_y.index
+
+def walk_forward_forecast(y, exog, order, seasonal_order, n_test=6, verbose=True, n_jobs=None, cache=True):
+    """
+    n_jobs=None fits the folds sequentially, warm-starting each fit from the previous fold's parameters.
+    Any other value fits every fold from scratch in parallel with joblib (n_jobs=-1 uses all cores).
+    cache=True returns the stored result when the same inputs were already backtested (see CACHE_FOLDER).
+    """
+    run = _walk_forward if cache else _walk_forward.func
+    y_true, y_pred, test_index = run(y, exog, order, seasonal_order, n_test, n_jobs)
 
     if verbose:
-        test_y = y[-n_test:]
-        y_true = test_y.values
-        y_pred = np.array(predictions)
         mae = mean_absolute_error(y_true, y_pred)
         rmse = np.sqrt(mean_squared_error(y_true, y_pred))
         bias = np.mean(y_pred - y_true)
 
 
 
-    return y_true, y_pred, test_y.index
+    return y_true, y_pred, test_index
 
 def print_model_evaluation(y_true, y_pred, y_naive=None, label="SARIMAX Model Forecast"):
-    mae = mean_absolute_error(y_true, y_pred)
-    rmse = np.sqrt(mean_squared_error(y_true, y_pred))
-    bias = np.mean(y_pred - y_true)
-    mape = np.mean(np.abs((y_true - y_pred) / y_true)) * 100
-    smape = 100 * np.mean(2 * np.abs(y_pred - y_true) / (np.abs(y_pred) + np.abs(y_true)))
-    r2 = r2_score(y_true, y_pred)
+    y_true = np.asarray(y_true, dtype=float)
+    y_pred = np.asarray(y_pred, dtype=float)
+
+    # The error metrics derive from the same error vector
+    err = y_pred - y_true
+    abs_err = np.abs(err)
+    abs_true = np.abs(y_true)
+    sq_err = err * err
+    mae = abs_err.mean()
+    rmse = np.sqrt(sq_err.mean())
+    bias = err.mean()
+    mape = (abs_err / abs_true).mean() * 100
+    smape = 200 * (abs_err / (np.abs(y_pred) + abs_true)).mean()
+    r2 = r2_score(y_true, y_pred)  # handles a constant y_true (1.0 for a perfect fit, else 0.0)
 
     print(f"\n📉 Evaluation on last {len(y_true)} observations:\n")
     print(f"🔷 {label}:")
@@ -54,9 +93,10 @@ def print_model_evaluation(y_true, y_pred, y_naive=None, label="SARIMAX Model Fo
     print(f"R²:    {r2:.4f}")
 
     if y_naive is not None:
-        mae_naive = mean_absolute_error(y_true, y_naive)
-        rmse_naive = np.sqrt(mean_squared_error(y_true, y_naive))
-        mape_naive = np.mean(np.abs((y_true - y_naive) / y_true)) * 100
+        abs_err_naive = np.abs(np.asarray(y_naive, dtype=float) - y_true)
+        mae_naive = abs_err_naive.mean()
+        rmse_naive = np.sqrt((abs_err_naive * abs_err_naive).mean())
+        mape_naive = (abs_err_naive / abs_true).mean() * 100
 
         print(f"\n🔸 Naive Benchmark Forecast:")
         print(f"MAE:   {mae_naive:.2f}")
@@ -64,19 +104,23 @@ def print_model_evaluation(y_true, y_pred, y_naive=None, label="SARIMAX Model Fo
         print(f"MAPE:  {mape_naive:.2f}%")
 
 def print_forecast_summary(forecast, reference_series, label="Forecast"):
-    last_real = reference_series.iloc[-1]
-    mean_recent = reference_series.tail(12).mean()
-    std_recent = reference_series.tail(12).std()
+    # Scalars only, so work on plain arrays; nan-aware with ddof=1 like the pandas reductions
+    reference = np.asarray(reference_series, dtype=float)
+    forecast = np.asarray(forecast, dtype=float)
+    last_real = reference[-1]
+    recent = reference[-12:]
+    mean_recent = np.nanmean(recent)
+    std_recent = np.nanstd(recent, ddof=1)
 
-    change = forecast.values - last_real
+    change = forecast - last_real
     pct_change = (change / last_real) * 100
 
     print(f"\n🧪 Simulated Forecast Evaluation ({label}):")
     print(f"Last known value:       {last_real:.2f}")
     print(f"Mean of last 12 months: {mean_recent:.2f}")
-    print(f"Forecast range:         {forecast.min():.2f} to {forecast.max():.2f}")
-    print(f"Mean forecast change:   {pct_change.mean():+.2f}%")
-    print(f"Forecast std vs hist:   {forecast.std():.2f} vs {std_recent:.2f}")
+    print(f"Forecast range:         {np.nanmin(forecast):.2f} to {np.nanmax(forecast):.2f}")
+    print(f"Mean forecast change:   {np.nanmean(pct_change):+.2f}%")
+    print(f"Forecast std vs hist:   {np.nanstd(forecast, ddof=1):.2f} vs {std_recent:.2f}")
 
 def simulate_exog_with_pct_trend(exog_df, n_periods, pct_map):
     """
@@ -85,13 +129,14 @@ def simulate_exog_with_pct_trend(exog_df, n_periods, pct_map):
     
     pct_map: dict of {col_name: total_pct_over_horizon}
     """
-    last = exog_df.iloc[-1].copy()
-    rows = []
-    for step in range(1, n_periods + 1):
-        new = last.copy()
-        for col, total_pct in pct_map.items():
-            if col in new:
-                monthly_rate = (1 + total_pct)**(1/n_periods) - 1
-                new[col] = last[col] * ((1 + monthly_rate) ** step)
-        rows.append(new.copy())
-    return pd.DataFrame(rows)
\ No newline at end of file
+    last = exog_df.iloc[-1]
+    steps = np.arange(1, n_periods + 1)
+    # Built per column from the last row, so each column keeps the dtype of its value (mixed frames included)
+    future = pd.DataFrame({col: np.repeat(last[col], n_periods) for col in exog_df.columns})
+    for col, total_pct in pct_map.items():
+        if col in last:
+            monthly_rate = (1 + total_pct)**(1/n_periods) - 1
+            grown = last[col] * (1 + monthly_rate) ** steps
+            # Float columns keep their width (e.g. float32 after downcast_dtypes); integers become float
+            future[col] = grown.astype(future[col].dtype) if future[col].dtype.kind == 'f' else grown
+    return future
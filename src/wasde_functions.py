@@ -2,26 +2,67 @@ import os
 import requests
 from bs4 import BeautifulSoup
 from pathlib import Path
-from config import WASDE_FOLDER, RAW_DATA
+import config
+from config import WASDE_FOLDER, RAW_DATA, CACHE_FOLDER, get_wasde_jwt, load_excel, write_processed
+import numpy as np
 import pandas as pd
 import os
 import re
+import hashlib
+import shutil
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
 from urllib.parse import urlparse
+from urllib3.util.retry import Retry
+from functools import wraps
+from joblib import Memory
 
+# Shared HTTP session: keeps connections to the USDA servers alive across requests and retries transient failures
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=Retry(total=3, backoff_factor=0.5)))
 
-# Fetches a list of WASDE report metadata from the USDA API, filtered by a date range. Requires a valid authentication token.
-def fetch_wasde_releases(token, start_date="2000-01-01", end_date="2026-01-01"):
+# Parsed reports are cached per parser version: editing this module starts a fresh cache
+_MEMORY = Memory(CACHE_FOLDER / "wasde" / hashlib.sha1(Path(__file__).read_bytes()).hexdigest()[:12], verbose=0)
+
+# Column renames shared by the supply and use tables; the first (label) column becomes 'country'
+_GRAIN_RENAME = {'Beginning\nStocks': 'beginning_stocks', 'Production': 'production',
+                 'Imports': 'imports', 'Domestic\nFeed': 'domestic_feed', 'Domestic\nTotal 2/': 'domestic_total',
+                 'Exports': 'exports', 'Ending\nStocks': 'ending_stocks', 'Domestic\nFeed 2/': 'domestic_feed'}
+_OILSEED_RENAME = {'Beginning\nStocks': 'beginning_stocks', 'Production': 'production',
+                   'Imports': 'imports', 'Domestic\nCrush': 'domestic_crush', 'Domestic\nTotal/': 'domestic_total',
+                   'Exports': 'exports', 'Ending\nStocks': 'ending_stocks', 'Domestic\nFeed 2/': 'domestic_feed'}
+
+# Country labels left by empty cells once the label column is converted to stripped strings.
+# 'None' labels are kept: the published outlook tables carry their *_none columns
+_BLANK_LABELS = frozenset(('nan', ''))
+
+# crop_stage labels of the current, next and outlook year blocks
+_CROP_STAGES = ('current year', 'next year', 'outlook year')
+
+# Key columns that keep their names through the per-stage renames
+_KEEP = frozenset(('report_date', 'country'))
+
+# Patterns shared by every table parser, compiled once
+_CROP_YEAR_RE = re.compile(r'\b\d{4}\s*/\s*\d{2}(?:\s*Est\.?)?', re.IGNORECASE)
+_FILLER_RE = re.compile(r'filler', re.IGNORECASE)
+
+
+# Fetches a list of WASDE report metadata from the USDA API, filtered by a date range. Requires a valid authentication token (defaults to WASDE_JWT from the .env file).
+def fetch_wasde_releases(token=None, start_date="2000-01-01", end_date="2026-01-01"):
+    if token is None:
+        token = get_wasde_jwt()
     headers = {"Accept": "application/json", "Authorization": f"Bearer {token}"}
     wasde_identifier = "wasde"
     url = f"https://usda.library.cornell.edu/api/v1/release/findByIdentifier/{wasde_identifier}?latest=false&start_date={start_date}&end_date={end_date}"
-    resp = requests.get(url, headers=headers)
+    resp = _SESSION.get(url, headers=headers)
     resp.raise_for_status()
     return resp.json()
 
-# Downloads .xls report files from the list of releases obtained via the API. Saves them to a local directory, optionally limiting the number of downloads.
-def download_release_files(releases, limit=None):
+# Downloads .xls report files from the list of releases obtained via the API. Saves them to a local directory, optionally limiting the number of downloads. Files are fetched concurrently over the shared session.
+def download_release_files(releases, limit=None, max_workers=16):
     WASDE_FOLDER.mkdir(parents=True, exist_ok=True)
-    downloaded = 0
+    pending = {}
 
     for release in releases:
         release_date = release.get("release_datetime", "")[:10]
@@ -34,38 +75,72 @@ def download_release_files(releases, limit=None):
                 filename = f"{release_date}_{filename}"
                 save_path = WASDE_FOLDER / filename
 
-                if save_path.exists():
+                if save_path.exists() or save_path in pending:
                     print(f"Already exists: {filename}, skipping.")
                     continue
+                pending[save_path] = file_url
 
-                file_resp = requests.get(file_url)
-                if file_resp.status_code == 200:
-                    with open(save_path, "wb") as f_out:
-                        f_out.write(file_resp.content)
-                    print(f"Downloaded: {filename}")
-                    downloaded += 1
-                    if limit and downloaded >= limit:
-                        return
-                else:
-                    print(f"Failed to download {file_url}: Status {file_resp.status_code}")
-
-# Scans a DataFrame to detect the row index where the header (usually starting with "beginning stocks") appears. Used to clean and standardize the structure of USDA tables.
-def detect_header_start(df, min_row=3, max_row=15):
-    for i in range(min_row, max_row):
-        row_values = df.iloc[i].astype(str).str.lower()
-        if any('beginning' in val for val in row_values):
-            return i
-    return 7
+    # Workers pull files from a shared queue; in-flight downloads count towards the limit
+    # until they finish, so a failed download frees its slot for the next pending file
+    jobs = iter(pending.items())
+    state = threading.Condition()
+    downloaded = 0
+    in_flight = 0
+
+    def worker():
+        nonlocal downloaded, in_flight
+        while True:
+            with state:
+                state.wait_for(lambda: not limit or downloaded >= limit or downloaded + in_flight < limit)
+                job = None if limit and downloaded >= limit else next(jobs, None)
+                if job is None:
+                    return
+                in_flight += 1
+            ok = False
+            try:
+                ok = _download_file(*job)
+            finally:
+                with state:
+                    in_flight -= 1
+                    downloaded += ok
+                    state.notify_all()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for future in [executor.submit(worker) for _ in range(max_workers)]:
+            future.result()
+
+# Streams one report file to disk over the shared session in 64 KB chunks. Returns True when the file was saved.
+def _download_file(save_path, file_url):
+    with _SESSION.get(file_url, stream=True, timeout=30) as file_resp:
+        if file_resp.status_code != 200:
+            print(f"Failed to download {file_url}: Status {file_resp.status_code}")
+            return False
+        # Written under a temporary name so an interrupted download is never taken for an existing file
+        part_path = save_path.with_name(f"{save_path.name}.part")
+        file_resp.raw.decode_content = True
+        with open(part_path, "wb") as f_out:
+            shutil.copyfileobj(file_resp.raw, f_out, length=1 << 16)
+        part_path.replace(save_path)
+    print(f"Downloaded: {save_path.name}")
+    return True
+
+# Scans a DataFrame to detect the row index where the header (usually starting with "beginning stocks") appears. Used to clean and standardize the structure of USDA tables. Rows are counted from the top of the sheet (read with header=None).
+def detect_header_start(df, min_row=4, max_row=16):
+    rows = df.iloc[min_row:max_row].astype(str)
+    hits = rows.apply(lambda col: col.str.lower().str.contains('beginning', regex=False)).any(axis=1).to_numpy()
+    if hits.any():
+        return min_row + int(hits.argmax())
+    return 8
+
+# Flags the rows that contain a crop year pattern (e.g., "2024/25") in any column, scanning all cells in a single vectorized pass.
+def crop_year_rows(df):
+    cells = pd.Series(df.to_numpy().ravel()).astype(str)
+    return cells.str.contains(_CROP_YEAR_RE).to_numpy().reshape(df.shape).any(axis=1)
 
 # Identifies the last row index in the DataFrame containing a crop year pattern (e.g., "2024/25"). Typically used to separate current and next marketing year data for grains like wheat and corn.
 def find_line(df):
-    pattern = re.compile(r'\b\d{4}\s*/\s*\d{2}(?:\s*Est\.?)?', re.IGNORECASE)
-    last_idx = None
-    for idx in range(len(df)):
-        row = df.iloc[idx, :].astype(str).str.lower().str.replace('\xa0', ' ').str.replace(r'\s+', ' ', regex=True)
-        if row.str.contains(pattern).any():
-            last_idx = idx
-    return last_idx
+    match_indices = np.flatnonzero(crop_year_rows(df))
+    return int(match_indices[-1]) if len(match_indices) else None
 
 # A more flexible version of find_line. It returns a list of all row indices that match a crop year pattern, useful when multiple blocks (e.g., current, next, outlook) exist in the same table (especially for soybeans).
 def find_line_v2(df):
@@ -73,15 +148,7 @@ def find_line_v2(df):
     Encontra todos os índices de linhas que contêm datas no formato 'YYYY/YY'.
     Retorna uma lista com os índices encontrados.
     """
-    pattern = re.compile(r'\b\d{4}\s*/\s*\d{2}(?:\s*Est\.?)?', re.IGNORECASE)
-    match_indices = []
-    
-    for idx in range(len(df)):
-        row = df.iloc[idx, :].astype(str).str.lower().str.replace('\xa0', ' ').str.replace(r'\s+', ' ', regex=True)
-        if row.str.contains(pattern).any():
-            match_indices.append(idx)
-    
-    return match_indices
+    return np.flatnonzero(crop_year_rows(df)).tolist()
 
 # Standardizes column names by converting them to lowercase, trimming whitespace, and removing duplicates. Helps with consistent downstream processing.
 def clean_columns(df):
@@ -91,587 +158,224 @@ def clean_columns(df):
 
 # Simplifies column names by removing suffixes (everything after an underscore), while preserving key columns like country and report_date.
 def reset_column_names(df):
-    return df.rename(columns={col: col.split('_')[0] if col not in ['country', 'report_date'] else col for col in df.columns})
+    return df.rename(columns={col: col.partition('_')[0] if col not in _KEEP else col for col in df.columns})
 
 # Reshapes the DataFrame by extracting data for multiple countries and renaming selected columns to encode metadata such as commodity type and crop stage. Consolidates the output into a single row per report date.
 def pivot_df(df, countries, pivot_cols, commodity, crop_stage):
-    df_pivot = pd.DataFrame()
-    report_date_col = None
-    for idx, country in enumerate(countries):
-        df_country = df[df['country'] == country].drop(columns=['country']).reset_index(drop=True).head(1)
-        if idx == 0:
-            report_date_col = df_country['report_date']
-        else:
-            df_country = df_country.drop(columns=['report_date'], errors='ignore')
-        df_country = df_country.rename(columns={col: f"{col.lower()}_{commodity}_{crop_stage}_{country.lower().replace(' ', '')}" for col in pivot_cols})
-        df_pivot = pd.concat([df_pivot, df_country], axis=1)
-    if report_date_col is not None:
-        if 'report_date' in df_pivot.columns:
-            df_pivot = df_pivot.drop(columns=['report_date'])
-        df_pivot.insert(0, 'report_date', report_date_col.reset_index(drop=True))
+    if len(countries) == 0:
+        return pd.DataFrame()
+    # First row of every country in one hash pass, in the requested country order
+    first_rows = df.drop_duplicates('country').set_index('country').reindex(countries)
+    # Positional, since the tables can repeat a column name (e.g. several 'domestic' columns)
+    block = [i for i, col in enumerate(first_rows.columns) if col != 'report_date']
+    block_cols = first_rows.columns[block]
+    columns = [
+        f"{col.lower()}_{commodity}_{crop_stage}_{country.lower().replace(' ', '')}" if col in pivot_cols else col
+        for country in countries for col in block_cols
+    ]
+    df_pivot = pd.DataFrame(first_rows.iloc[:, block].to_numpy(dtype=object).reshape(1, -1), columns=columns)
+    df_pivot.insert(0, 'report_date', first_rows['report_date'].iloc[:1].to_numpy())
     return df_pivot
 
+# Memoizes a report parser (called as parse(wasde_path, *args)) on disk. Published reports never change, so later runs load the parsed frames instead of parsing the workbook again; pass use_cache=False to force a re-parse. The file's modification time and size are part of the key, so a replaced or re-downloaded report (e.g. one that was truncated and cached as None) is parsed again.
+def report_cache(parse):
+    @_MEMORY.cache
+    def cached_parse(wasde_path, mtime_ns, size, *args):
+        return parse(wasde_path, *args)
+
+    @wraps(parse)
+    def wrapper(wasde_path, *args, use_cache=True):
+        if not use_cache:
+            return parse(wasde_path, *args)
+        wasde_path = Path(wasde_path)
+        stat = wasde_path.stat()
+        return cached_parse(wasde_path, stat.st_mtime_ns, stat.st_size, *args)
+    return wrapper
+
 ######################################################################################################
 # Commodities
 ######################################################################################################
 
-# Wheat
-def process_wheat(wasde_path):
-    try:
-        df_wheat_raw = pd.read_excel(wasde_path, sheet_name='Page 18')
-        df_wheat_raw2 = pd.read_excel(wasde_path, sheet_name='Page 19')
-    except Exception as e:
-        print(f"⚠️ Error reading {wasde_path}: {e}")
-        return None
-
-    header_idx = detect_header_start(df_wheat_raw)
-    df_wheat_raw = df_wheat_raw.iloc[header_idx:]
-    header = df_wheat_raw.iloc[0]
-    df_wheat_raw = df_wheat_raw[1:]
-    df_wheat_raw.columns = header
-
-    filename = os.path.basename(wasde_path)
-    report_date = filename.split('_')[0]
-    df_wheat_raw['report_date'] = report_date
-
-    broken_line = find_line(df_wheat_raw)
-
-    df_wheat_current = df_wheat_raw.iloc[:broken_line].copy()
-    df_wheat_next = df_wheat_raw.iloc[broken_line + 1:].copy()
-
-    df_wheat_current = df_wheat_current[~df_wheat_current.iloc[:, 0].astype(str).str.contains('Est.')].dropna(how='all')
-    df_wheat_next = df_wheat_next[~df_wheat_next.iloc[:, 0].astype(str).str.contains('Est.')].dropna(how='all')
-
-    df_wheat_current['crop_stage'] = "current year"
-    df_wheat_next['crop_stage'] = "next year"
-
-    df_wheat_raw2 = df_wheat_raw2.iloc[7:]
-    header2 = df_wheat_raw2.iloc[0]
-    df_wheat_raw2 = df_wheat_raw2[1:]
-    df_wheat_raw2.columns = header2
-    df_wheat_raw2 = df_wheat_raw2.dropna(axis=1, how='all')
-    df_wheat_raw2.iloc[:, 0] = df_wheat_raw2.iloc[:, 0].shift(1)
-    df_wheat_raw2 = df_wheat_raw2.dropna(how='all')
-    df_wheat_raw2 = df_wheat_raw2.loc[:, ~df_wheat_raw2.columns.isna()]
-    df_wheat_current = df_wheat_current.loc[:, ~df_wheat_current.columns.isna()]
-    df_wheat_next = df_wheat_next.loc[:, ~df_wheat_next.columns.isna()]
-    df_wheat_raw2['report_date'] = report_date
-
-    columns_dict = {df_wheat_raw2.columns[0]: 'country', 'Beginning\nStocks': 'beginning_stocks', 'Production': 'production',
-                    'Imports': 'imports', 'Domestic\nFeed': 'domestic_feed', 'Domestic\nTotal 2/': 'domestic_total',
-                    'Exports': 'exports', 'Ending\nStocks': 'ending_stocks', 'Domestic\nFeed 2/': 'domestic_feed'}
-
-    columns_dict2 = {df_wheat_current.columns[0]: 'country', 'Beginning\nStocks': 'beginning_stocks', 'Production': 'production',
-                        'Imports': 'imports', 'Domestic\nFeed': 'domestic_feed', 'Domestic\nTotal 2/': 'domestic_total',
-                        'Exports': 'exports', 'Ending\nStocks': 'ending_stocks', 'Domestic\nFeed 2/': 'domestic_feed'}
-
-    columns_dict3 = {df_wheat_next.columns[0]: 'country', 'Beginning\nStocks': 'beginning_stocks', 'Production': 'production',
-                        'Imports': 'imports', 'Domestic\nFeed': 'domestic_feed', 'Domestic\nTotal 2/': 'domestic_total',
-                        'Exports': 'exports', 'Ending\nStocks': 'ending_stocks', 'Domestic\nFeed 2/': 'domestic_feed'}
-
-    df_wheat_raw2 = df_wheat_raw2.rename(columns=columns_dict)
-    df_wheat_current = df_wheat_current.rename(columns=columns_dict2)
-    df_wheat_next = df_wheat_next.rename(columns=columns_dict3)
-
-    df_wheat_raw2['country'] = df_wheat_raw2['country'].astype(str).str.strip()
-    df_wheat_current['country'] = df_wheat_current['country'].astype(str).str.strip()
-    df_wheat_next['country'] = df_wheat_next['country'].astype(str).str.strip()
-
-    df_wheat_raw2['crop_stage'] = 'outlook year'
-    df_wheat_outlook = df_wheat_raw2.dropna(subset=['country'], how='all').reset_index(drop=True)
-    df_wheat_outlook = df_wheat_outlook[~df_wheat_outlook['production'].astype(str).str.lower().str.contains('filler', na=False)]
-    df_wheat_outlook = df_wheat_outlook[~df_wheat_outlook['country'].astype(str).str.lower().str.contains('nan', na=False)]
-
-    df_wheat = pd.concat([df_wheat_current, df_wheat_next, df_wheat_outlook], ignore_index=True).dropna()
-    df_wheat['commodity'] = "wheat"
-    df_wheat = df_wheat.iloc[:-1]
-
-    commodity = 'wheat'
-    crop_current = 'cy'
-    crop_next = 'ny'
-    crop_outlook = 'oy'
-
-    df_wheat_current = df_wheat_current.rename(
-        columns={col: f"{col}_{commodity}_{crop_current}" for col in df_wheat_current.columns if col not in ['report_date', 'country']}
-    )
-    df_wheat_next = df_wheat_next.rename(
-        columns={col: f"{col}_{commodity}_{crop_next}" for col in df_wheat_next.columns if col not in ['report_date', 'country']}
-    )
-    df_wheat_outlook = df_wheat_outlook.rename(
-        columns={col: f"{col}_{commodity}_{crop_outlook}" for col in df_wheat_outlook.columns if col not in ['report_date', 'country']}
-    )
-
-    df_wheat_current = df_wheat_current.dropna().iloc[:-1]
-    df_wheat_next = df_wheat_next.dropna().iloc[:-1]
-    df_wheat_outlook = df_wheat_outlook.dropna().iloc[:-1]
-
-    df_wheat_current.drop(f'crop_stage_{commodity}_{crop_current}', axis=1, inplace=True)
-    df_wheat_next.drop(f'crop_stage_{commodity}_{crop_next}', axis=1, inplace=True)
-    df_wheat_outlook.drop(f'crop_stage_{commodity}_{crop_outlook}', axis=1, inplace=True)
-
-    df_wheat_current = reset_column_names(df_wheat_current)
-    df_wheat_next = reset_column_names(df_wheat_next)
-    df_wheat_outlook = reset_column_names(df_wheat_outlook)
-
-    countries_current = df_wheat_current['country'].unique()
-    pivot_current = [col for col in df_wheat_current.columns if col not in ['country', 'report_date']]
-    countries_next = df_wheat_next['country'].unique()
-    pivot_next = [col for col in df_wheat_next.columns if col not in ['country', 'report_date']]
-    countries_outlook = df_wheat_outlook['country'].unique()
-    pivot_outlook = [col for col in df_wheat_outlook.columns if col not in ['country', 'report_date']]
-
-    df_wheat_current = pivot_df(df_wheat_current, countries_current, pivot_current, commodity='wheat', crop_stage='cy')
-    df_wheat_next = pivot_df(df_wheat_next, countries_next, pivot_next, commodity='wheat', crop_stage='ny')
-    df_wheat_outlook = pivot_df(df_wheat_outlook, countries_outlook, pivot_outlook, commodity='wheat', crop_stage='oy')
-
-    df_wheat_current = clean_columns(df_wheat_current)
-    df_wheat_next = clean_columns(df_wheat_next)
-    df_wheat_outlook = clean_columns(df_wheat_outlook)
-    return df_wheat, df_wheat_current, df_wheat_next, df_wheat_outlook
-
-###################################
-# Corn
-
-def process_corn(wasde_path):
-    try:
-        df_corn_raw = pd.read_excel(wasde_path, sheet_name='Page 22')
-        df_corn_raw2 = pd.read_excel(wasde_path, sheet_name='Page 23')
-    except Exception as e:
-        print(f"⚠️ Error reading {wasde_path}: {e}")
-        return None
-
-    header_idx = detect_header_start(df_corn_raw)
-    df_corn_raw = df_corn_raw.iloc[header_idx:]
-    header = df_corn_raw.iloc[0]
-    df_corn_raw = df_corn_raw[1:]
-    df_corn_raw.columns = header
-
-    filename = os.path.basename(wasde_path)
-    report_date = filename.split('_')[0]
-    df_corn_raw['report_date'] = report_date
-
-    broken_line = find_line(df_corn_raw)
-
-    df_corn_current = df_corn_raw.iloc[:broken_line].copy()
-    df_corn_next = df_corn_raw.iloc[broken_line + 1:].copy()
-
-    df_corn_current = df_corn_current[~df_corn_current.iloc[:, 0].astype(str).str.contains('Est.')].dropna(how='all')
-    df_corn_next = df_corn_next[~df_corn_next.iloc[:, 0].astype(str).str.contains('Est.')].dropna(how='all')
-
-    df_corn_current['crop_stage'] = "current year"
-    df_corn_next['crop_stage'] = "next year"
-
-    header2 = detect_header_start(df_corn_raw2)
-    df_corn_raw2 = df_corn_raw2.iloc[header2:]
-    header2 = df_corn_raw2.iloc[0]
-    df_corn_raw2 = df_corn_raw2[1:]
-    df_corn_raw2.columns = header2
-
-    df_corn_raw2 = df_corn_raw2.dropna(axis=1, how='all')
-    df_corn_raw2.iloc[:, 0] = df_corn_raw2.iloc[:, 0].shift(1)
-    df_corn_raw2 = df_corn_raw2.dropna(how='all')
-    df_corn_raw2 = df_corn_raw2.loc[:, ~df_corn_raw2.columns.isna()]
-    df_corn_current = df_corn_current.loc[:, ~df_corn_current.columns.isna()]
-    df_corn_next = df_corn_next.loc[:, ~df_corn_next.columns.isna()]
-    df_corn_raw2['report_date'] = report_date
-
-    columns_dict = {df_corn_raw2.columns[0]: 'country', 'Beginning\nStocks': 'beginning_stocks', 'Production': 'production',
-                        'Imports': 'imports', 'Domestic\nFeed': 'domestic_feed', 'Domestic\nTotal 2/': 'domestic_total',
-                        'Exports': 'exports', 'Ending\nStocks': 'ending_stocks', 'Domestic\nFeed 2/': 'domestic_feed'}
-
-    columns_dict2 = {df_corn_current.columns[0]: 'country', 'Beginning\nStocks': 'beginning_stocks', 'Production': 'production',
-                        'Imports': 'imports', 'Domestic\nFeed': 'domestic_feed', 'Domestic\nTotal 2/': 'domestic_total',
-                        'Exports': 'exports', 'Ending\nStocks': 'ending_stocks', 'Domestic\nFeed 2/': 'domestic_feed'}
-
-    columns_dict3 = {df_corn_next.columns[0]: 'country', 'Beginning\nStocks': 'beginning_stocks', 'Production': 'production',
-                        'Imports': 'imports', 'Domestic\nFeed': 'domestic_feed', 'Domestic\nTotal 2/': 'domestic_total',
-                        'Exports': 'exports', 'Ending\nStocks': 'ending_stocks', 'Domestic\nFeed 2/': 'domestic_feed'}
-
-    df_corn_outlook = df_corn_raw2.rename(columns=columns_dict)
-    df_corn_current = df_corn_current.rename(columns=columns_dict2)
-    df_corn_next = df_corn_next.rename(columns=columns_dict3)
-
-    df_corn_outlook['country'] = df_corn_outlook['country'].astype(str).str.strip()
-    df_corn_current['country'] = df_corn_current['country'].astype(str).str.strip()
-    df_corn_next['country'] = df_corn_next['country'].astype(str).str.strip()
-
-    df_corn_outlook['crop_stage'] = 'outlook year'
-    df_corn_current = df_corn_current.dropna(subset=['production', 'exports'], how='all').reset_index(drop=True)
-    df_corn_next = df_corn_next.dropna(subset=['production', 'exports'], how='all').reset_index(drop=True)
-    df_corn_outlook = df_corn_outlook.dropna(subset=['production', 'exports'], how='all').reset_index(drop=True)
-    df_corn_outlook = df_corn_outlook.dropna(subset=['country'], how='all').reset_index(drop=True)
-    df_corn_outlook = df_corn_outlook[~df_corn_outlook['production'].astype(str).str.lower().str.contains('filler', na=False)]
-    df_corn_outlook = df_corn_outlook[~df_corn_outlook['country'].astype(str).str.lower().str.contains('nan', na=False)]
-
-    df_corn = pd.concat([df_corn_current, df_corn_next, df_corn_outlook], ignore_index=True).dropna()
-
-    df_corn['commodity'] = "corn"
-    df_corn = df_corn.iloc[:-1]
-
-    countries_current = df_corn_current['country'].unique()
-    pivot_current = [col for col in df_corn_current.columns if col not in ['country', 'report_date']]
-    countries_next = df_corn_next['country'].unique()
-    pivot_next = [col for col in df_corn_next.columns if col not in ['country', 'report_date']]
-    countries_outlook = df_corn_outlook['country'].unique()
-    pivot_outlook = [col for col in df_corn_outlook.columns if col not in ['country', 'report_date']]
-
-    df_corn_current = pivot_df(df_corn_current, countries_current, pivot_current, commodity='corn', crop_stage='cy')
-    df_corn_next = pivot_df(df_corn_next, countries_next, pivot_next, commodity='corn', crop_stage='ny')
-    df_corn_outlook = pivot_df(df_corn_outlook, countries_outlook, pivot_outlook, commodity='corn', crop_stage='oy')
-
-    df_corn_current = clean_columns(df_corn_current)
-    df_corn_next = clean_columns(df_corn_next)
-    df_corn_outlook = clean_columns(df_corn_outlook)
-    return df_corn, df_corn_current, df_corn_next, df_corn_outlook
-
-###################################
-# Soybean
-
-def process_soybean(wasde_path):
-    try:
-        df_soybean_raw = pd.read_excel(wasde_path, sheet_name='Page 28')
-    except Exception as e:
-        print(f"⚠️ Error reading {wasde_path}: {e}")
-        return None
-    
-    header_idx = detect_header_start(df_soybean_raw)
-    df_soybean_raw = df_soybean_raw.iloc[header_idx:]
-    header = df_soybean_raw.iloc[0]
-    df_soybean_raw = df_soybean_raw[1:]
-    df_soybean_raw.columns = header
-
-    filename = os.path.basename(wasde_path)
-    report_date = filename.split('_')[0]
-    df_soybean_raw['report_date'] = report_date
-
-    broken_line = find_line_v2(df_soybean_raw)
-
-    df_soybean_current = df_soybean_raw.iloc[:broken_line[0]].copy()
-    df_soybean_next = df_soybean_raw.iloc[broken_line[0]+1:broken_line[1]].copy()
-    df_soybean_outlook = df_soybean_raw.iloc[broken_line[1]+1:].copy()
-
-    df_soybean_current = df_soybean_current[~df_soybean_current.iloc[:, 0].astype(str).str.contains('Est.')].dropna(how='all')
-    df_soybean_next = df_soybean_next[~df_soybean_next.iloc[:, 0].astype(str).str.contains('Est.')].dropna(how='all')
-
-    df_soybean_current['crop_stage'] = "current year"
-    df_soybean_next['crop_stage'] = "next year"
-    df_soybean_outlook['crop_stage'] = "outlook year"
-
-    df_soybean_current = df_soybean_current.dropna(axis=1, how='all')
-    df_soybean_next = df_soybean_next.dropna(axis=1, how='all')
-    df_soybean_outlook = df_soybean_outlook.dropna(axis=1, how='all')
-
-    df_soybean_outlook.iloc[:, 0] = df_soybean_outlook.iloc[:, 0].shift(1)
-
-    df_soybean_current = df_soybean_current.dropna(subset=['Production', 'Exports'])
-    df_soybean_next = df_soybean_next.dropna(subset=['Production', 'Exports'])
-    df_soybean_outlook = df_soybean_outlook.dropna(subset=['Production', 'Exports'])
-
-    df_soybean_current = df_soybean_current.loc[:, ~df_soybean_current.columns.isna()]
-    df_soybean_next = df_soybean_next.loc[:, ~df_soybean_next.columns.isna()]
-    df_soybean_outlook = df_soybean_outlook.loc[:, ~df_soybean_outlook.columns.isna()]
-
-    columns_dict = {df_soybean_current.columns[0]: 'country', 'Beginning\nStocks': 'beginning_stocks', 'Production': 'production',
-                    'Imports': 'imports', 'Domestic\nCrush': 'domestic_crush', 'Domestic\nTotal/': 'domestic_total',
-                    'Exports': 'exports', 'Ending\nStocks': 'ending_stocks', 'Domestic\nFeed 2/': 'domestic_feed'}
-
-    columns_dict2 = {df_soybean_next.columns[0]: 'country', 'Beginning\nStocks': 'beginning_stocks', 'Production': 'production',
-                    'Imports': 'imports', 'Domestic\nCrush': 'domestic_crush', 'Domestic\nTotal/': 'domestic_total',
-                    'Exports': 'exports', 'Ending\nStocks': 'ending_stocks', 'Domestic\nFeed 2/': 'domestic_feed'}
-
-    columns_dict3 = {df_soybean_outlook.columns[0]: 'country', 'Beginning\nStocks': 'beginning_stocks', 'Production': 'production',
-                    'Imports': 'imports', 'Domestic\nCrush': 'domestic_crush', 'Domestic\nTotal/': 'domestic_total',
-                    'Exports': 'exports', 'Ending\nStocks': 'ending_stocks', 'Domestic\nFeed 2/': 'domestic_feed'}
-
-    df_soybean_current = df_soybean_current.rename(columns=columns_dict)
-    df_soybean_next = df_soybean_next.rename(columns=columns_dict2)
-    df_soybean_outlook = df_soybean_outlook.rename(columns=columns_dict3)
-
-    df_soybean_current['country'] = df_soybean_current['country'].astype(str).str.strip()
-    df_soybean_next['country'] = df_soybean_next['country'].astype(str).str.strip()
-    df_soybean_outlook['country'] = df_soybean_outlook['country'].astype(str).str.strip()
-    df_soybean_outlook = df_soybean_outlook[~df_soybean_outlook['country'].astype(str).str.lower().str.contains('nan', na=False)]
-    df_soybean_outlook = df_soybean_outlook[~df_soybean_outlook['country'].astype(str).str.lower().str.contains('None', na=False)]
-
-    df_soybean_outlook = df_soybean_outlook.dropna(subset='country')
-
-    df_soybean = pd.concat([df_soybean_current, df_soybean_next, df_soybean_outlook], ignore_index=True).dropna()
-    df_soybean['commodity'] = "soybean"
-
-    commodity = 'soybean'
-    crop_current = 'cy'
-    crop_next = 'ny'
-    crop_outlook = 'oy'
-
-    df_soybean_current = df_soybean_current.rename(
-        columns={col: f"{col}_{commodity}_{crop_current}" for col in df_soybean_current.columns if col not in ['report_date', 'country']}
-    )
-    df_soybean_next = df_soybean_next.rename(
-        columns={col: f"{col}_{commodity}_{crop_next}" for col in df_soybean_next.columns if col not in ['report_date', 'country']}
-    )
-    df_soybean_outlook = df_soybean_outlook.rename(
-        columns={col: f"{col}_{commodity}_{crop_outlook}" for col in df_soybean_outlook.columns if col not in ['report_date', 'country']}
-    )
-
-    df_soybean_current = df_soybean_current.dropna().iloc[:-1]
-    df_soybean_next = df_soybean_next.dropna().iloc[:-1]
-    df_soybean_outlook = df_soybean_outlook.dropna().iloc[:-1]
-
-    df_soybean_current.drop(f'crop_stage_{commodity}_{crop_current}', axis=1, inplace=True)
-    df_soybean_next.drop(f'crop_stage_{commodity}_{crop_next}', axis=1, inplace=True)
-    df_soybean_outlook.drop(f'crop_stage_{commodity}_{crop_outlook}', axis=1, inplace=True)
-
-    df_soybean_current = reset_column_names(df_soybean_current)
-    df_soybean_next = reset_column_names(df_soybean_next)
-    df_soybean_outlook = reset_column_names(df_soybean_outlook)
-
-    countries_current = df_soybean_current['country'].unique()
-    pivot_current = [col for col in df_soybean_current.columns if col not in ['country', 'report_date']]
-    countries_next = df_soybean_next['country'].unique()
-    pivot_next = [col for col in df_soybean_next.columns if col not in ['country', 'report_date']]
-    countries_outlook = df_soybean_outlook['country'].unique()
-    pivot_outlook = [col for col in df_soybean_outlook.columns if col not in ['country', 'report_date']]
-
-    df_soybean_current = pivot_df(df_soybean_current, countries_current, pivot_current, commodity='soybean', crop_stage='cy')
-    df_soybean_next = pivot_df(df_soybean_next, countries_next, pivot_next, commodity='soybean', crop_stage='ny')
-    df_soybean_outlook = pivot_df(df_soybean_outlook, countries_outlook, pivot_outlook, commodity='soybean', crop_stage='oy')
-
-    df_soybean_current = clean_columns(df_soybean_current)
-    df_soybean_next = clean_columns(df_soybean_next)
-    df_soybean_outlook = clean_columns(df_soybean_outlook)
-    return df_soybean, df_soybean_current, df_soybean_next, df_soybean_outlook
-
-###################################
-# Soybean oil
-
-def process_soybean_oil(wasde_path):
+# Reads one sheet of a report (None when the workbook or sheet can't be read).
+def read_sheet(wasde_path, sheet):
     try:
-        df_soybean_oil_raw = pd.read_excel(wasde_path, sheet_name='Page 30')
+        return load_excel(wasde_path, sheet, header=None, dtype=object)
     except Exception as e:
         print(f"⚠️ Error reading {wasde_path}: {e}")
         return None
-    
-    header_idx = detect_header_start(df_soybean_oil_raw)
-    df_soybean_oil_raw = df_soybean_oil_raw.iloc[header_idx:]
-    header = df_soybean_oil_raw.iloc[0]
-    df_soybean_oil_raw = df_soybean_oil_raw[1:]
-    df_soybean_oil_raw.columns = header
-
-    filename = os.path.basename(wasde_path)
-    report_date = filename.split('_')[0]
-    df_soybean_oil_raw['report_date'] = report_date
-
-    broken_line = find_line_v2(df_soybean_oil_raw)
-
-    df_soybean_oil_current = df_soybean_oil_raw.iloc[:broken_line[0]].copy()
-    df_soybean_oil_next = df_soybean_oil_raw.iloc[broken_line[0]+1:broken_line[1]].copy()
-    df_soybean_oil_outlook = df_soybean_oil_raw.iloc[broken_line[1]+1:].copy()
-
-    df_soybean_oil_current = df_soybean_oil_current[~df_soybean_oil_current.iloc[:, 0].astype(str).str.contains('Est.')].dropna(how='all')
-    df_soybean_oil_next = df_soybean_oil_next[~df_soybean_oil_next.iloc[:, 0].astype(str).str.contains('Est.')].dropna(how='all')
-
-    df_soybean_oil_current['crop_stage'] = "current year"
-    df_soybean_oil_next['crop_stage'] = "next year"
-    df_soybean_oil_outlook['crop_stage'] = "outlook year"
-
-    df_soybean_oil_current = df_soybean_oil_current.dropna(axis=1, how='all')
-    df_soybean_oil_next = df_soybean_oil_next.dropna(axis=1, how='all')
-    df_soybean_oil_outlook = df_soybean_oil_outlook.dropna(axis=1, how='all')
-
-    df_soybean_oil_outlook.iloc[:, 0] = df_soybean_oil_outlook.iloc[:, 0].shift(1)
-
-    df_soybean_oil_current = df_soybean_oil_current.dropna(subset=['Production', 'Exports'])
-    df_soybean_oil_next = df_soybean_oil_next.dropna(subset=['Production', 'Exports'])
-    df_soybean_oil_outlook = df_soybean_oil_outlook.dropna(subset=['Production', 'Exports'])
-
-    df_soybean_oil_current = df_soybean_oil_current.loc[:, ~df_soybean_oil_current.columns.isna()]
-    df_soybean_oil_next = df_soybean_oil_next.loc[:, ~df_soybean_oil_next.columns.isna()]
-    df_soybean_oil_outlook = df_soybean_oil_outlook.loc[:, ~df_soybean_oil_outlook.columns.isna()]
-
-    columns_dict = {df_soybean_oil_current.columns[0]: 'country', 'Beginning\nStocks': 'beginning_stocks', 'Production': 'production',
-                    'Imports': 'imports', 'Domestic\nCrush': 'domestic_crush', 'Domestic\nTotal/': 'domestic_total',
-                    'Exports': 'exports', 'Ending\nStocks': 'ending_stocks', 'Domestic\nFeed 2/': 'domestic_feed'}
-
-    columns_dict2 = {df_soybean_oil_next.columns[0]: 'country', 'Beginning\nStocks': 'beginning_stocks', 'Production': 'production',
-                    'Imports': 'imports', 'Domestic\nCrush': 'domestic_crush', 'Domestic\nTotal/': 'domestic_total',
-                    'Exports': 'exports', 'Ending\nStocks': 'ending_stocks', 'Domestic\nFeed 2/': 'domestic_feed'}
-
-    columns_dict3 = {df_soybean_oil_outlook.columns[0]: 'country', 'Beginning\nStocks': 'beginning_stocks', 'Production': 'production',
-                    'Imports': 'imports', 'Domestic\nCrush': 'domestic_crush', 'Domestic\nTotal/': 'domestic_total',
-                    'Exports': 'exports', 'Ending\nStocks': 'ending_stocks', 'Domestic\nFeed 2/': 'domestic_feed'}
-
-    df_soybean_oil_current = df_soybean_oil_current.rename(columns=columns_dict)
-    df_soybean_oil_next = df_soybean_oil_next.rename(columns=columns_dict2)
-    df_soybean_oil_outlook = df_soybean_oil_outlook.rename(columns=columns_dict3)
-
-    df_soybean_oil_current['country'] = df_soybean_oil_current['country'].astype(str).str.strip()
-    df_soybean_oil_next['country'] = df_soybean_oil_next['country'].astype(str).str.strip()
-    df_soybean_oil_outlook['country'] = df_soybean_oil_outlook['country'].astype(str).str.strip()
-    df_soybean_oil_outlook = df_soybean_oil_outlook[~df_soybean_oil_outlook['country'].astype(str).str.lower().str.contains('nan', na=False)]
-    df_soybean_oil_outlook = df_soybean_oil_outlook[~df_soybean_oil_outlook['country'].astype(str).str.lower().str.contains('None', na=False)]
-
-    df_soybean_oil_outlook = df_soybean_oil_outlook.dropna(subset='country')
-
-    df_soybean_oil = pd.concat([df_soybean_oil_current, df_soybean_oil_next, df_soybean_oil_outlook], ignore_index=True).dropna()
-    df_soybean_oil['commodity'] = "soybean_oil"
-
-    commodity = 'soybean_oil'
-    crop_current = 'cy'
-    crop_next = 'ny'
-    crop_outlook = 'oy'
-
-    df_soybean_oil_current = df_soybean_oil_current.rename(
-        columns={col: f"{col}_{commodity}_{crop_current}" for col in df_soybean_oil_current.columns if col not in ['report_date', 'country']}
-    )
-    df_soybean_oil_next = df_soybean_oil_next.rename(
-        columns={col: f"{col}_{commodity}_{crop_next}" for col in df_soybean_oil_next.columns if col not in ['report_date', 'country']}
-    )
-    df_soybean_oil_outlook = df_soybean_oil_outlook.rename(
-        columns={col: f"{col}_{commodity}_{crop_outlook}" for col in df_soybean_oil_outlook.columns if col not in ['report_date', 'country']}
-    )
-
-    df_soybean_oil_current = df_soybean_oil_current.dropna().iloc[:-1]
-    df_soybean_oil_next = df_soybean_oil_next.dropna().iloc[:-1]
-    df_soybean_oil_outlook = df_soybean_oil_outlook.dropna().iloc[:-1]
-
-    df_soybean_oil_current.drop(f'crop_stage_{commodity}_{crop_current}', axis=1, inplace=True)
-    df_soybean_oil_next.drop(f'crop_stage_{commodity}_{crop_next}', axis=1, inplace=True)
-    df_soybean_oil_outlook.drop(f'crop_stage_{commodity}_{crop_outlook}', axis=1, inplace=True)
-
-    df_soybean_oil_current = reset_column_names(df_soybean_oil_current)
-    df_soybean_oil_next = reset_column_names(df_soybean_oil_next)
-    df_soybean_oil_outlook = reset_column_names(df_soybean_oil_outlook)
-
-    countries_current = df_soybean_oil_current['country'].unique()
-    pivot_current = [col for col in df_soybean_oil_current.columns if col not in ['country', 'report_date']]
-    countries_next = df_soybean_oil_next['country'].unique()
-    pivot_next = [col for col in df_soybean_oil_next.columns if col not in ['country', 'report_date']]
-    countries_outlook = df_soybean_oil_outlook['country'].unique()
-    pivot_outlook = [col for col in df_soybean_oil_outlook.columns if col not in ['country', 'report_date']]
-
-    df_soybean_oil_current = pivot_df(df_soybean_oil_current, countries_current, pivot_current, commodity='soybean_oil', crop_stage='cy')
-    df_soybean_oil_next = pivot_df(df_soybean_oil_next, countries_next, pivot_next, commodity='soybean_oil', crop_stage='ny')
-    df_soybean_oil_outlook = pivot_df(df_soybean_oil_outlook, countries_outlook, pivot_outlook, commodity='soybean_oil', crop_stage='oy')
-
-    df_soybean_oil_current = clean_columns(df_soybean_oil_current)
-    df_soybean_oil_next = clean_columns(df_soybean_oil_next)
-    df_soybean_oil_outlook = clean_columns(df_soybean_oil_outlook)
-    return df_soybean_oil, df_soybean_oil_current, df_soybean_oil_next, df_soybean_oil_outlook
 
+# Promotes the header row (detected when header_row is None) to column names and drops the unnamed columns, plus the empty ones when drop_empty is set.
+def set_header(df, header_row=None, drop_empty=False):
+    if header_row is None:
+        header_row = detect_header_start(df)
+    # Sheets are read as object, so the body is cut from the raw array in one take instead of chained frame slices
+    values = df.to_numpy()
+    header = values[header_row]
+    body = values[header_row + 1:]
+    keep = pd.notna(header)
+    if drop_empty:
+        keep &= pd.notna(body).any(axis=0)
+    columns = pd.Index(header[keep], name=df.index[header_row])
+    return pd.DataFrame(body[:, keep], index=df.index[header_row + 1:], columns=columns)
+
+# Cuts a table into consecutive current, next (and outlook) year blocks at the crop year rows in breaks, which are dropped, and labels each row's crop_stage from one segment id. "Est." rows are dropped from the current and next year blocks.
+def split_blocks(df, breaks):
+    rows = np.arange(len(df))
+    segment = np.searchsorted(breaks, rows)
+    not_est = ~df.iloc[:, 0].astype(str).str.contains('Est.', regex=False).to_numpy()
+    keep = ~np.isin(rows, breaks) & (not_est | (segment == 2))
+    segment = segment[keep]
+    df = df[keep].assign(crop_stage=np.asarray(_CROP_STAGES)[segment])
+    return [df[segment == i] for i in range(len(breaks) + 1)]
+
+# Moves the label column of an outlook block down one row, in place. Works on the raw array and writes it back positionally, with no Series alignment.
+def shift_labels(df):
+    labels = df.iloc[:, 0].to_numpy()
+    shifted = np.empty_like(labels)
+    shifted[:1] = None  # what Series.shift fills an object column with
+    shifted[1:] = labels[:-1]
+    df.isetitem(0, shifted)
+
+# Splits a grain table (wheat, corn) into current, next and outlook blocks: the first sheet holds the current and next years around the last crop year row, the second sheet holds the outlook year.
+def split_grain(sheets, report_date, cfg):
+    df_raw = set_header(sheets[0])
+    df_raw['report_date'] = report_date
+
+    df_current, df_next = split_blocks(df_raw, [find_line(df_raw)])
+
+    df_outlook = set_header(sheets[1], cfg['outlook_header'], drop_empty=True)
+    shift_labels(df_outlook)
+
+    # Outlook rows are filtered with one mask and copied once, by the assign
+    is_filler = df_outlook['Production'].astype(str).str.contains(_FILLER_RE, na=False).to_numpy()
+    has_data = df_outlook[['Production', 'Exports']].notna().any(axis=1).to_numpy()
+    df_outlook = df_outlook[has_data & ~is_filler].assign(report_date=report_date, crop_stage='outlook year')
+
+    return [df.dropna(subset=['Production', 'Exports'], how='all') for df in (df_current, df_next)] + [df_outlook]
+
+# Splits an oilseed table (soybean, oil, meal) into current, next and outlook blocks, which follow each other on one sheet separated by crop year rows.
+def split_oilseed(sheets, report_date, cfg):
+    df_raw = set_header(sheets[0])
+    df_raw['report_date'] = report_date
+
+    # Later crop year rows belong to the outlook block
+    df_current, df_next, df_outlook = split_blocks(df_raw, find_line_v2(df_raw)[:2])
+    shift_labels(df_outlook)
+
+    # Complete rows and non-empty columns in one selection per block (a column can be empty within one block only)
+    return [
+        df.loc[df[['Production', 'Exports']].notna().all(axis=1).to_numpy(), df.notna().any().to_numpy()]
+        for df in (df_current, df_next, df_outlook)
+    ]
+
+# Per-commodity parsing settings:
+#   sheets         sheets read from the report, in the order the split function expects them
+#   split          function returning the current, next and outlook blocks with the sheet's own headers
+#   rename         header renames applied to every block (the label column always becomes 'country')
+#   outlook_header header row of the grain outlook sheet (None to detect it)
+#   drop_last      the combined table drops its last outlook row, like the per-stage tables
+#   trim_stages    per-stage tables keep complete rows minus the last one and short column names;
+#                  corn's have always been pivoted straight from the blocks
+COMMODITIES = {
+    'wheat': {'sheets': ('Page 18', 'Page 19'), 'split': split_grain, 'rename': _GRAIN_RENAME,
+              'outlook_header': 8, 'drop_last': True, 'trim_stages': True},
+    'corn': {'sheets': ('Page 22', 'Page 23'), 'split': split_grain, 'rename': _GRAIN_RENAME,
+             'outlook_header': None, 'drop_last': True, 'trim_stages': False},
+    'soybean': {'sheets': ('Page 28',), 'split': split_oilseed, 'rename': _OILSEED_RENAME,
+                'drop_last': False, 'trim_stages': True},
+    'soybean_oil': {'sheets': ('Page 30',), 'split': split_oilseed, 'rename': _OILSEED_RENAME,
+                    'drop_last': False, 'trim_stages': True},
+    'soybean_meal': {'sheets': ('Page 29',), 'split': split_oilseed, 'rename': _OILSEED_RENAME,
+                     'drop_last': False, 'trim_stages': True},
+}
+
+# Parses one commodity of a report as configured in COMMODITIES. Returns the combined table of complete rows plus the current, next and outlook year tables pivoted to one row per report (None when a sheet can't be read).
+@report_cache
+def process_commodity(wasde_path, commodity):
+    cfg = COMMODITIES[commodity]
+    sheets = []
+    for sheet in cfg['sheets']:
+        df = read_sheet(wasde_path, sheet)
+        if df is None:
+            return None
+        sheets.append(df)
+
+    report_date = os.path.basename(wasde_path).partition('_')[0]
+    blocks = cfg['split'](sheets, report_date, cfg)
+    # The split blocks are fresh frames, so they are renamed in place
+    for df in blocks:
+        df.rename(columns={df.columns[0]: 'country', **cfg['rename']}, inplace=True)
+        df['country'] = df['country'].astype(str).str.strip()
+    blocks[2] = blocks[2][~blocks[2]['country'].str.lower().isin(_BLANK_LABELS)]
+
+    df_all = pd.concat(blocks, ignore_index=True).dropna()
+    if cfg['drop_last']:
+        df_all = df_all.iloc[:-1]
+    # Sheets are read as object; the measurement cells are numbers, so they get an explicit float dtype
+    measurements = {col: 'float64' for col in df_all.columns if col not in _KEEP and col != 'crop_stage'}
+    df_all = df_all.astype(measurements).assign(commodity=commodity)
+
+    stages = []
+    for df, crop_stage in zip(blocks, ('cy', 'ny', 'oy')):
+        if cfg['trim_stages']:
+            df = reset_column_names(df.drop(columns='crop_stage').dropna().iloc[:-1])
+        countries = df['country'].unique()
+        pivot_cols = [col for col in df.columns if col not in _KEEP]
+        stages.append(clean_columns(pivot_df(df, countries, pivot_cols, commodity=commodity, crop_stage=crop_stage)))
+    return (df_all, *stages)
+
+# Per-commodity entry points, kept for the notebooks
+def process_wheat(wasde_path, use_cache=True):
+    return process_commodity(wasde_path, 'wheat', use_cache=use_cache)
+
+def process_corn(wasde_path, use_cache=True):
+    return process_commodity(wasde_path, 'corn', use_cache=use_cache)
+
+def process_soybean(wasde_path, use_cache=True):
+    return process_commodity(wasde_path, 'soybean', use_cache=use_cache)
+
+def process_soybean_oil(wasde_path, use_cache=True):
+    return process_commodity(wasde_path, 'soybean_oil', use_cache=use_cache)
+
+def process_soybean_meal(wasde_path, use_cache=True):
+    return process_commodity(wasde_path, 'soybean_meal', use_cache=use_cache)
 
-###################################
-# Soybean meal
+######################################################################################################
+# Batch processing
+######################################################################################################
 
-def process_soybean_meal(wasde_path):
-    try:
-        df_soybean_meal_raw = pd.read_excel(wasde_path, sheet_name='Page 29')
-    except Exception as e:
-        print(f"⚠️ Error reading {wasde_path}: {e}")
-        return None
-    
-    header_idx = detect_header_start(df_soybean_meal_raw)
-    df_soybean_meal_raw = df_soybean_meal_raw.iloc[header_idx:]
-    header = df_soybean_meal_raw.iloc[0]
-    df_soybean_meal_raw = df_soybean_meal_raw[1:]
-    df_soybean_meal_raw.columns = header
-
-    filename = os.path.basename(wasde_path)
-    report_date = filename.split('_')[0]
-    df_soybean_meal_raw['report_date'] = report_date
-
-    broken_line = find_line_v2(df_soybean_meal_raw)
-
-    df_soybean_meal_current = df_soybean_meal_raw.iloc[:broken_line[0]].copy()
-    df_soybean_meal_next = df_soybean_meal_raw.iloc[broken_line[0]+1:broken_line[1]].copy()
-    df_soybean_meal_outlook = df_soybean_meal_raw.iloc[broken_line[1]+1:].copy()
-
-    df_soybean_meal_current = df_soybean_meal_current[~df_soybean_meal_current.iloc[:, 0].astype(str).str.contains('Est.')].dropna(how='all')
-    df_soybean_meal_next = df_soybean_meal_next[~df_soybean_meal_next.iloc[:, 0].astype(str).str.contains('Est.')].dropna(how='all')
-
-    df_soybean_meal_current['crop_stage'] = "current year"
-    df_soybean_meal_next['crop_stage'] = "next year"
-    df_soybean_meal_outlook['crop_stage'] = "outlook year"
-
-    df_soybean_meal_current = df_soybean_meal_current.dropna(axis=1, how='all')
-    df_soybean_meal_next = df_soybean_meal_next.dropna(axis=1, how='all')
-    df_soybean_meal_outlook = df_soybean_meal_outlook.dropna(axis=1, how='all')
-
-    df_soybean_meal_outlook.iloc[:, 0] = df_soybean_meal_outlook.iloc[:, 0].shift(1)
-
-    df_soybean_meal_current = df_soybean_meal_current.dropna(subset=['Production', 'Exports'])
-    df_soybean_meal_next = df_soybean_meal_next.dropna(subset=['Production', 'Exports'])
-    df_soybean_meal_outlook = df_soybean_meal_outlook.dropna(subset=['Production', 'Exports'])
-
-    df_soybean_meal_current = df_soybean_meal_current.loc[:, ~df_soybean_meal_current.columns.isna()]
-    df_soybean_meal_next = df_soybean_meal_next.loc[:, ~df_soybean_meal_next.columns.isna()]
-    df_soybean_meal_outlook = df_soybean_meal_outlook.loc[:, ~df_soybean_meal_outlook.columns.isna()]
-
-    columns_dict = {df_soybean_meal_current.columns[0]: 'country', 'Beginning\nStocks': 'beginning_stocks', 'Production': 'production',
-                    'Imports': 'imports', 'Domestic\nCrush': 'domestic_crush', 'Domestic\nTotal/': 'domestic_total',
-                    'Exports': 'exports', 'Ending\nStocks': 'ending_stocks', 'Domestic\nFeed 2/': 'domestic_feed'}
-
-    columns_dict2 = {df_soybean_meal_next.columns[0]: 'country', 'Beginning\nStocks': 'beginning_stocks', 'Production': 'production',
-                    'Imports': 'imports', 'Domestic\nCrush': 'domestic_crush', 'Domestic\nTotal/': 'domestic_total',
-                    'Exports': 'exports', 'Ending\nStocks': 'ending_stocks', 'Domestic\nFeed 2/': 'domestic_feed'}
-
-    columns_dict3 = {df_soybean_meal_outlook.columns[0]: 'country', 'Beginning\nStocks': 'beginning_stocks', 'Production': 'production',
-                    'Imports': 'imports', 'Domestic\nCrush': 'domestic_crush', 'Domestic\nTotal/': 'domestic_total',
-                    'Exports': 'exports', 'Ending\nStocks': 'ending_stocks', 'Domestic\nFeed 2/': 'domestic_feed'}
-
-    df_soybean_meal_current = df_soybean_meal_current.rename(columns=columns_dict)
-    df_soybean_meal_next = df_soybean_meal_next.rename(columns=columns_dict2)
-    df_soybean_meal_outlook = df_soybean_meal_outlook.rename(columns=columns_dict3)
-
-    df_soybean_meal_current['country'] = df_soybean_meal_current['country'].astype(str).str.strip()
-    df_soybean_meal_next['country'] = df_soybean_meal_next['country'].astype(str).str.strip()
-    df_soybean_meal_outlook['country'] = df_soybean_meal_outlook['country'].astype(str).str.strip()
-    df_soybean_meal_outlook = df_soybean_meal_outlook[~df_soybean_meal_outlook['country'].astype(str).str.lower().str.contains('nan', na=False)]
-    df_soybean_meal_outlook = df_soybean_meal_outlook[~df_soybean_meal_outlook['country'].astype(str).str.lower().str.contains('None', na=False)]
-
-    df_soybean_meal_outlook = df_soybean_meal_outlook.dropna(subset='country')
-
-    df_soybean_meal = pd.concat([df_soybean_meal_current, df_soybean_meal_next, df_soybean_meal_outlook], ignore_index=True).dropna()
-    df_soybean_meal['commodity'] = "soybean_meal"
-
-    commodity = 'soybean_meal'
-    crop_current = 'cy'
-    crop_next = 'ny'
-    crop_outlook = 'oy'
-
-    df_soybean_meal_current = df_soybean_meal_current.rename(
-        columns={col: f"{col}_{commodity}_{crop_current}" for col in df_soybean_meal_current.columns if col not in ['report_date', 'country']}
-    )
-    df_soybean_meal_next = df_soybean_meal_next.rename(
-        columns={col: f"{col}_{commodity}_{crop_next}" for col in df_soybean_meal_next.columns if col not in ['report_date', 'country']}
-    )
-    df_soybean_meal_outlook = df_soybean_meal_outlook.rename(
-        columns={col: f"{col}_{commodity}_{crop_outlook}" for col in df_soybean_meal_outlook.columns if col not in ['report_date', 'country']}
-    )
-
-    df_soybean_meal_current = df_soybean_meal_current.dropna().iloc[:-1]
-    df_soybean_meal_next = df_soybean_meal_next.dropna().iloc[:-1]
-    df_soybean_meal_outlook = df_soybean_meal_outlook.dropna().iloc[:-1]
-
-    df_soybean_meal_current.drop(f'crop_stage_{commodity}_{crop_current}', axis=1, inplace=True)
-    df_soybean_meal_next.drop(f'crop_stage_{commodity}_{crop_next}', axis=1, inplace=True)
-    df_soybean_meal_outlook.drop(f'crop_stage_{commodity}_{crop_outlook}', axis=1, inplace=True)
-
-    df_soybean_meal_current = reset_column_names(df_soybean_meal_current)
-    df_soybean_meal_next = reset_column_names(df_soybean_meal_next)
-    df_soybean_meal_outlook = reset_column_names(df_soybean_meal_outlook)
-
-    countries_current = df_soybean_meal_current['country'].unique()
-    pivot_current = [col for col in df_soybean_meal_current.columns if col not in ['country', 'report_date']]
-    countries_next = df_soybean_meal_next['country'].unique()
-    pivot_next = [col for col in df_soybean_meal_next.columns if col not in ['country', 'report_date']]
-    countries_outlook = df_soybean_meal_outlook['country'].unique()
-    pivot_outlook = [col for col in df_soybean_meal_outlook.columns if col not in ['country', 'report_date']]
-
-    df_soybean_meal_current = pivot_df(df_soybean_meal_current, countries_current, pivot_current, commodity='soybean_meal', crop_stage='cy')
-    df_soybean_meal_next = pivot_df(df_soybean_meal_next, countries_next, pivot_next, commodity='soybean_meal', crop_stage='ny')
-    df_soybean_meal_outlook = pivot_df(df_soybean_meal_outlook, countries_outlook, pivot_outlook, commodity='soybean_meal', crop_stage='oy')
-
-    df_soybean_meal_current = clean_columns(df_soybean_meal_current)
-    df_soybean_meal_next = clean_columns(df_soybean_meal_next)
-    df_soybean_meal_outlook = clean_columns(df_soybean_meal_outlook)
-    return df_soybean_meal, df_soybean_meal_current, df_soybean_meal_next, df_soybean_meal_outlook
\ No newline at end of file
+# Runs every commodity parser on one report and returns their results keyed by commodity.
+def process_wasde_file(wasde_path):
+    return {commodity: process_commodity(wasde_path, commodity) for commodity in COMMODITIES}
+
+# Processes many WASDE files in parallel worker processes (one report per task) and concatenates each commodity's (all, current, next, outlook) frames in input order, with a categorical country column in the combined table. Reports a parser cannot read are skipped, like in the per-commodity loops.
+def process_all(paths, max_workers=None):
+    paths = list(paths)
+    results = [None] * len(paths)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(process_wasde_file, path): i for i, path in enumerate(paths)}
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+
+    combined = {}
+    for commodity in COMMODITIES:
+        parts = [result[commodity] for result in results if result[commodity] is not None]
+        combined[commodity] = tuple(pd.concat(frames, ignore_index=True, sort=False) for frames in zip(*parts))
+        if combined[commodity]:
+            # A couple dozen countries repeated over thousands of report rows
+            df_all = combined[commodity][0]
+            df_all['country'] = df_all['country'].astype('category')
+    return combined
+
+# Writes process_all output to the processed tables defined in config (WHEAT, WHEAT_CURRENT, ..., SOYBEAN_MEAL_OUTLOOK) as zstd Parquet, plus the combined COMMODITY table.
+def save_processed(combined):
+    for commodity, frames in combined.items():
+        for suffix, df in zip(('', '_CURRENT', '_NEXT', '_OUTLOOK'), frames):
+            write_processed(df, getattr(config, f"{commodity.upper()}{suffix}"))
+    tables = [frames[0] for frames in combined.values() if frames]
+    if not tables:  # no report produced any frames, so there is no COMMODITY table to write
+        return
+    df_commodity = pd.concat(tables, ignore_index=True)
+    # Concatenating different categories falls back to object
+    df_commodity['country'] = df_commodity['country'].astype('category')
+    write_processed(df_commodity, config.COMMODITY)